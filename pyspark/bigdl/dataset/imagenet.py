@@ -0,0 +1,216 @@
+#
+# Copyright 2016 The BigDL Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+
+import cv2
+import numpy as np
+
+from bigdl.util.common import Sample
+
+# Spark already runs one python worker per task slot, so letting OpenCV fan
+# each resize/decode out over all cores would oversubscribe the node with
+# tasks x cores threads. Keep OpenCV single threaded inside every worker.
+try:
+    cv2.setNumThreads(1)
+    cv2.ocl.setUseOpenCL(False)
+except AttributeError:
+    pass  # very old OpenCV builds lack these switches
+
+try:
+    # libjpeg-turbo decodes with a SIMD IDCT, 2-4x faster than the stock
+    # libjpeg behind cv2.imdecode; it is optional and initialized once per
+    # python worker process here.
+    from turbojpeg import TurboJPEG
+    _turbo_jpeg = TurboJPEG()
+except Exception:
+    _turbo_jpeg = None
+
+IMAGE_BATCH_SIZE = 128
+
+
+def _decode_image(data):
+    """
+    Decode raw image bytes to a BGR ndarray, through libjpeg-turbo when it
+    is available and falling back to OpenCV for other formats.
+    """
+    if _turbo_jpeg is not None:
+        try:
+            return _turbo_jpeg.decode(data)
+        except Exception:
+            pass  # not a jpeg, let OpenCV sniff the format
+    return cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+
+
+def _batch_samples(buf, batch_labels, mean, inv_norm):
+    """
+    Normalize the first len(batch_labels) images of the batch buffer and
+    emit one Sample per image.
+    """
+    features = buf[:len(batch_labels)].astype(np.float32)
+    if mean is not None:
+        features -= mean
+    features *= inv_norm
+    for i, label in enumerate(batch_labels):
+        yield Sample.from_ndarray(features[i], label)
+
+
+def resize_image(img, resize_width, resize_height, interpolation=cv2.INTER_LINEAR):
+    # INTER_LINEAR touches a fixed 2x2 neighbourhood per target pixel and is
+    # 2-3x faster than INTER_AREA for the typical jpeg-to-256x256 downscale,
+    # with equivalent quality for training; pass interpolation=cv2.INTER_AREA
+    # to get the averaging resampler back.
+    return cv2.resize(img, (resize_width, resize_height), interpolation=interpolation)
+
+
+def load_mean_file(mean_file):
+    """
+    Load the pixel-wise mean of the training set from a numpy binary file.
+
+    :param mean_file: path of the mean file, saved by numpy.save
+    :return: a float32 ndarray of shape [height, width, channel]
+    """
+    return np.load(mean_file).astype(np.float32)
+
+
+def _list_category_dirs(sc, folder):
+    """
+    List the first-level sub directory names of folder, sorted, through the
+    Hadoop FileSystem API so only metadata is touched. Works for any
+    hadoop-supported filesystem as well as plain posix paths.
+    """
+    path = sc._jvm.org.apache.hadoop.fs.Path(folder)
+    fs = path.getFileSystem(sc._jsc.hadoopConfiguration())
+    return sorted(status.getPath().getName()
+                  for status in fs.listStatus(path) if status.isDirectory())
+
+
+def read_local_path(folder, has_label=True):
+    """
+    Read a local image directory and return a list of (path, label).
+
+    Images of one category are stored in the same sub directory and the
+    label of a category is its position (starting from 1) in the sorted
+    list of sub directory names.
+
+    :param folder: the directory storing the images
+    :param has_label: whether the categories are stored in sub directories
+    :return: a list of (image path, label)
+    """
+    dirs = sorted(os.listdir(folder))
+    if has_label:
+        # dirs.index(d) is a linear scan per file, which turns the listing
+        # of the 1000-category imagenet layout into a billion comparisons.
+        label_map = {d: i + 1 for i, d in enumerate(dirs)}
+        image_paths = [(os.path.join(folder, d, f), label_map[d])
+                       for d in dirs for f in os.listdir(os.path.join(folder, d))]
+    else:
+        image_paths = [(os.path.join(folder, f), -1) for f in dirs]
+    return image_paths
+
+
+def read_local(sc, folder, normalize=255.0, has_label=True, mean_bcast=None):
+    """
+    Read images from a directory into an RDD of Sample.
+
+    The images are loaded through sc.binaryFiles, so folder may live on any
+    hadoop-supported filesystem and the bytes are read on the executors with
+    locality instead of through a shared posix mount on every worker.
+
+    :param sc: spark context
+    :param folder: the directory storing the images
+    :param normalize: pixel values are divided by this value
+    :param has_label: whether the categories are stored in sub directories
+    :param mean_bcast: an optional broadcast of the pixel-wise mean returned
+                       by load_mean_file, subtracted before normalization.
+                       Broadcasting ships the 256x256x3 array once per
+                       executor instead of once per task in the closure.
+    :return: RDD of Sample, whose features are 256x256 BGR images in float32
+    """
+    if has_label:
+        # Enumerate the category directories through filesystem metadata
+        # only; deriving them from the binaryFiles keys would run a full
+        # job that reads every image just to collect its path.
+        dirs = _list_category_dirs(sc, folder)
+        label_map = sc.broadcast({d: i + 1 for i, d in enumerate(dirs)})
+        raw = sc.binaryFiles(os.path.join(folder, "*", "*"))
+    else:
+        raw = sc.binaryFiles(os.path.join(folder, "*"))
+        label_map = None
+
+    def load_image(path_bytes):
+        # Decode and resize IMAGE_BATCH_SIZE images at a time into one
+        # preallocated uint8 buffer, then normalize the whole batch with a
+        # few whole-array ufunc passes. This caps per-record allocations at
+        # one decoded image and keeps the resize target hot in cache.
+        inv_norm = np.float32(1.0 / normalize)
+        mean = mean_bcast.value if mean_bcast else None
+        labels = label_map.value if label_map else None
+        if labels:
+            # Every record's label is a 1-element int32 view into one shared
+            # buffer instead of a freshly boxed ndarray per file.
+            label_array = np.arange(1, len(labels) + 1, dtype=np.int32)
+            label_views = dict((d, label_array[i - 1:i]) for d, i in labels.items())
+        else:
+            no_label = np.array([-1], dtype=np.int32)
+        buf = np.empty((IMAGE_BATCH_SIZE, 256, 256, 3), dtype=np.uint8)
+        batch_labels = []
+        for path, data in path_bytes:
+            img = _decode_image(data)
+            cv2.resize(img, (256, 256), dst=buf[len(batch_labels)],
+                       interpolation=cv2.INTER_LINEAR)
+            batch_labels.append(
+                label_views[os.path.basename(os.path.dirname(path))]
+                if labels else no_label)
+            if len(batch_labels) == IMAGE_BATCH_SIZE:
+                for sample in _batch_samples(buf, batch_labels, mean, inv_norm):
+                    yield sample
+                batch_labels = []
+        if batch_labels:
+            for sample in _batch_samples(buf, batch_labels, mean, inv_norm):
+                yield sample
+
+    return raw.mapPartitions(load_image)
+
+
+def read_seq_file(sc, folder, normalize=255.0):
+    """
+    Read images from a hadoop sequence file into an RDD of Sample.
+
+    The key of each record is the bare label, or "<image name>\n<label>"
+    when the file was generated with --hasName, and the value is an int32
+    width and an int32 height in big endian followed by the raw BGR pixel
+    bytes, as written by BGRImgToLocalSeqFile.
+
+    :param sc: spark context
+    :param folder: the sequence file directory
+    :param normalize: pixel values are divided by this value
+    :return: RDD of Sample
+    """
+    inv_norm = np.float32(1.0 / normalize)
+
+    def parse(name_img):
+        name, img = name_img
+        header = np.frombuffer(img, dtype='>i4', count=2)
+        width = int(header[0])
+        height = int(header[1])
+        channels = (len(img) - 8) // (width * height)
+        features = np.frombuffer(img, dtype=np.uint8, offset=8).astype(np.float32)
+        np.multiply(features, inv_norm, out=features)
+        label = np.array(float(name.split("\n")[-1]))
+        return Sample.from_ndarray(features.reshape(height, width, channels), label)
+
+    return sc.sequenceFile(folder).map(parse)
@@ -17,6 +17,7 @@
 
 
 import gzip
+from io import BytesIO
 
 import numpy
 
@@ -24,6 +25,11 @@ from bigdl.dataset import base
 
 SOURCE_URL = 'http://yann.lecun.com/exdb/mnist/'
 
+TRAIN_IMAGES = 'train-images-idx3-ubyte.gz'
+TRAIN_LABELS = 'train-labels-idx1-ubyte.gz'
+TEST_IMAGES = 't10k-images-idx3-ubyte.gz'
+TEST_LABELS = 't10k-labels-idx1-ubyte.gz'
+
 TRAIN_MEAN = 0.13066047740239506 * 255
 TRAIN_STD = 0.3081078 * 255
 TEST_MEAN = 0.13251460696903547 * 255
@@ -43,13 +49,14 @@ def extract_images(f):
     :raise: ValueError: If the bytestream does not start with 2051.
 
     """
-    print('Extracting', f.name)
+    name = getattr(f, 'name', '<bytes>')
+    print('Extracting', name)
     with gzip.GzipFile(fileobj=f) as bytestream:
         magic = _read32(bytestream)
         if magic != 2051:
             raise ValueError(
                 'Invalid magic number %d in MNIST image file: %s' %
-                (magic, f.name))
+                (magic, name))
         num_images = _read32(bytestream)
         rows = _read32(bytestream)
         cols = _read32(bytestream)
@@ -60,19 +67,42 @@ def extract_images(f):
 
 
 def extract_labels(f):
-    print('Extracting', f.name)
+    name = getattr(f, 'name', '<bytes>')
+    print('Extracting', name)
     with gzip.GzipFile(fileobj=f) as bytestream:
         magic = _read32(bytestream)
         if magic != 2049:
             raise ValueError(
                 'Invalid magic number %d in MNIST label file: %s' %
-                (magic, f.name))
+                (magic, name))
         num_items = _read32(bytestream)
         buf = bytestream.read(num_items)
         labels = numpy.frombuffer(buf, dtype=numpy.uint8)
         return labels
 
 
+def extract_images_from_bytes(raw):
+    """
+    Extract images from the raw bytes of a gzipped idx3 file, so parsing
+    can run inside an executor on data read by sc.binaryFiles.
+
+    :param raw: the bytes of the gzipped image file
+    :return: data: A 4D uint8 numpy array [index, y, x, depth].
+    """
+    return extract_images(BytesIO(raw))
+
+
+def extract_labels_from_bytes(raw):
+    """
+    Extract labels from the raw bytes of a gzipped idx1 file, so parsing
+    can run inside an executor on data read by sc.binaryFiles.
+
+    :param raw: the bytes of the gzipped label file
+    :return: labels: A 1D uint8 numpy array.
+    """
+    return extract_labels(BytesIO(raw))
+
+
 def read_data_sets(train_dir, data_type="train"):
     """
     Parse or download mnist data if train_dir is empty.
@@ -90,11 +120,6 @@ def read_data_sets(train_dir, data_type="train"):
     ```
 
     """
-    TRAIN_IMAGES = 'train-images-idx3-ubyte.gz'
-    TRAIN_LABELS = 'train-labels-idx1-ubyte.gz'
-    TEST_IMAGES = 't10k-images-idx3-ubyte.gz'
-    TEST_LABELS = 't10k-labels-idx1-ubyte.gz'
-
     if data_type == "train":
         local_file = base.maybe_download(TRAIN_IMAGES, train_dir,
                                          SOURCE_URL + TRAIN_IMAGES)
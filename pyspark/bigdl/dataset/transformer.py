@@ -15,12 +15,16 @@
 #
 
 
+import numpy as np
+
 from bigdl.util.common import Sample
 
 
 def normalizer(data, mean, std):
     """
     Normalize features by standard deviation
-    data is a ndarray
+    data is a ndarray, the result is float32 since that is what the
+    BigDL tensors hold anyway and it halves the bytes serialized
+    between the Python stages
     """
-    return (data - mean) / std
+    return ((data - np.float32(mean)) / np.float32(std)).astype(np.float32, copy=False)
@@ -47,13 +47,31 @@ def get_mnist(sc, data_type="train", location="/tmp/mnist"):
 
     :param sc: SparkContext
     :param data_type: training data or testing data
-    :param location: Location storing the mnist
+    :param location: Location storing the mnist. When this is a URI on a
+     distributed filesystem (e.g. hdfs://...), the idx files are read and
+     parsed on the executors through sc.binaryFiles instead of being
+     funneled through the driver.
     :return: A RDD of (features: Ndarray, label: Ndarray)
     """
+    if "://" in location:
+        if data_type == "train":
+            images_name, labels_name = mnist.TRAIN_IMAGES, mnist.TRAIN_LABELS
+        else:
+            images_name, labels_name = mnist.TEST_IMAGES, mnist.TEST_LABELS
+        images = sc.binaryFiles(location + "/" + images_name)\
+            .flatMap(lambda name_bytes: mnist.extract_images_from_bytes(name_bytes[1]))
+        # Target start from 1 in BigDL
+        labels = sc.binaryFiles(location + "/" + labels_name)\
+            .flatMap(lambda name_bytes: mnist.extract_labels_from_bytes(name_bytes[1]) + 1)
+        # Each idx file is one non-splittable record, so the zipped RDD has a
+        # single partition; spread it out before any downstream Python work
+        # runs, zipping first to keep the image/label alignment.
+        return images.zip(labels).repartition(sc.defaultParallelism * 2)
     (images, labels) = mnist.read_data_sets(location, data_type)
-    images = sc.parallelize(images)
-    labels = sc.parallelize(labels + 1) # Target start from 1 in BigDL
-    record = images.zip(labels)
+    # Zip on the driver and parallelize once so that no second RDD and no
+    # zip stage with its partition alignment is needed.
+    record = sc.parallelize(list(zip(images, labels + 1)),  # Target start from 1 in BigDL
+                            sc.defaultParallelism * 2)
     return record
 
 
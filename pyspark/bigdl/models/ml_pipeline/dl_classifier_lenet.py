@@ -0,0 +1,97 @@
+#
+# Copyright 2016 The BigDL Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from optparse import OptionParser
+from bigdl.dataset import mnist
+from bigdl.models.lenet.lenet5 import build_model, get_mnist
+from bigdl.models.ml_pipeline.dl_classifier import *
+from bigdl.nn.criterion import *
+from bigdl.util.common import *
+from pyspark import SparkContext, StorageLevel
+from pyspark.sql import SQLContext
+from pyspark.sql.types import *
+
+
+if __name__ == "__main__":
+    parser = OptionParser()
+    parser.add_option("-b", "--batchSize", type=int, dest="batchSize", default="128")
+    parser.add_option("-m", "--maxEpoch", type=int, dest="maxEpoch", default="20")
+    parser.add_option("-d", "--dataPath", dest="dataPath", default="/tmp/mnist")
+
+    (options, args) = parser.parse_args(sys.argv)
+
+    # Records flowing through this pipeline are ndarray-backed tuples, so the
+    # context keeps the default pickler but batches 1024 records per pickle
+    # call to cut the per-record serializer overhead.
+    sc = SparkContext(appName="DLClassifierLeNet",
+                      conf=create_spark_conf(),
+                      batchSize=1024)
+    sqlContext = SQLContext(sc)
+    redire_spark_logs()
+    show_bigdl_info_logs()
+    init_engine()
+
+    def normalize_partition(mean, std):
+        # float32 constants keep the normalized batch in float32, matching
+        # the float32-native BigDL tensors without a second conversion.
+        mean = np.float32(mean)
+        inv_std = np.float32(1.0 / std)
+
+        def normalize(records):
+            # Stack the whole partition and normalize it with one
+            # subtract-multiply over the batch instead of calling the Python
+            # normalizer once per record.
+            records = list(records)
+            if not records:
+                return
+            batch = np.stack([features for features, label in records])
+            batch = (batch.reshape(len(records), -1) - mean) * inv_std
+            for i, (features, label) in enumerate(records):
+                yield (batch[i], label)
+        return normalize
+
+    train_data = get_mnist(sc, "train", options.dataPath)\
+        .mapPartitions(normalize_partition(mnist.TRAIN_MEAN, mnist.TRAIN_STD))
+    # Keep the normalized records around so refits do not re-read mnist from
+    # the driver and normalize it again; the serialized level is ~4x more
+    # compact than caching the deserialized ndarrays.
+    train_data.persist(StorageLevel.MEMORY_ONLY_SER)
+    test_data = get_mnist(sc, "test", options.dataPath)\
+        .mapPartitions(normalize_partition(mnist.TEST_MEAN, mnist.TEST_STD))
+
+    # Spark vectors are double-based, so a float array column is the only
+    # representation that stays float32 on the JVM: it halves the DataFrame
+    # heap during fit and spares DLEstimatorBase the double-to-float cast.
+    schema = StructType([
+        StructField("features", ArrayType(FloatType(), False), False),
+        StructField("label", DoubleType(), False)])
+    train_df = sqlContext.createDataFrame(
+        train_data.map(lambda features_label:
+                       (features_label[0].tolist(), float(features_label[1]))),
+        schema)
+    test_df = sqlContext.createDataFrame(
+        test_data.map(lambda features_label:
+                      (features_label[0].tolist(), float(features_label[1]))),
+        schema)
+
+    classifier = DLClassifier(build_model(10), ClassNLLCriterion(), [28, 28])\
+        .setBatchSize(options.batchSize)\
+        .setMaxEpoch(options.maxEpoch)
+    model = classifier.fit(train_df)
+
+    predictions = model.transform(test_df)
+    predictions.show()
+    sc.stop()
@@ -16,22 +16,20 @@
 
 import tempfile
 
-import tensorflow as tf
 import shutil
 
-from google.protobuf import text_format
-
-from tensorflow.core.framework import graph_pb2
-from tensorflow.python.client import session
-from tensorflow.python.framework import graph_util
-from tensorflow.python.framework import importer
-from tensorflow.python.platform import gfile
 from bigdl.nn.layer import Model
 from bigdl.util.common import JTensor
 from bigdl.util.common import callBigDlFunc
 import os
 
+# Importing tensorflow takes seconds and a few hundred MB of memory, so the
+# tensorflow and protobuf imports live inside the functions that need them
+# and only run when a conversion is actually requested.
+
+
 def get_path(output_name, sess=None):
+    import tensorflow as tf
 
     if sess is None:
         sess = tf.Session()
@@ -87,6 +85,7 @@ def export_checkpoint(checkpoint_path):
     :param checkpoint_path: tensorflow checkpoint path
     :return: dictionary of tensor. The key is the variable name and the value is the numpy
     """
+    import tensorflow as tf
     reader = tf.train.NewCheckpointReader(checkpoint_path)
 
     # Get tensor name list
@@ -133,6 +132,8 @@ def dump_model(path, graph=None, sess=None, ckpt_file=None, bigdl_type="float"):
     :param bigdl_type: model variable numeric type
     :return: nothing
     """
+    import tensorflow as tf
+    from tensorflow.python.platform import gfile
     if not os.path.isdir(path):
         raise ValueError("Folder " + path + " does not exist")
 
@@ -178,6 +179,12 @@ def merge_checkpoint(input_graph,
         output_graph: String of the location and the name of the
             output graph
     """
+    from google.protobuf import text_format
+    from tensorflow.core.framework import graph_pb2
+    from tensorflow.python.framework import graph_util
+    from tensorflow.python.framework import importer
+    from tensorflow.python.platform import gfile
+
     restore_op_name = "save/restore_all"
     filename_tensor_name = "save/Const:0"
 